@@ -35,7 +35,8 @@ def make(
     plane_config: str="config/i-16_falangist.yaml",
     env_config: str="config/default_env.yaml",
     target_config: str="config/default_target.yaml",
-    seed: int=None
+    seed: int=None,
+    record_history: bool=False
 ) -> BaseEnv:
     """
     Make function for Target_Terminator
@@ -57,6 +58,8 @@ def make(
         configuration. See config/default_target.yaml for more 
         info.
         - seed (int): Seed for randomizer. If None, no seed is used.
+        - record_history (bool): Record the observation history, which 
+        is needed to save it when closing the environment.
 
     @returns:
         Environment corresponding to the provided parameters.
@@ -68,17 +71,25 @@ def make(
                 plane_config, 
                 env_config, 
                 target_config, 
-                seed
+                seed,
+                record_history
             )
         case "keyboard":
             env = HumanControlEnv(
                 plane_config, 
                 env_config, 
                 target_config, 
-                seed
+                seed,
+                record_history
             )
         # anything that is not "human" or "keyboard" gets interpreted
         # as no gui.
         case _:
-            env = BaseEnv(plane_config, env_config, target_config, seed)
+            env = BaseEnv(
+                plane_config, 
+                env_config, 
+                target_config, 
+                seed, 
+                record_history
+            )
     return env
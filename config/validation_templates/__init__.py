@@ -5,8 +5,72 @@ This file enables constructions like:
 `import config.validation_templates as templates`
 
 For documentation on the specific templates, see the individual files.
+
+Besides the raw templates, this file exposes `get_validator()`, which
+returns a cached validator instance per template, and `validate()`, 
+which validates a document with it. Building a validator checks and 
+compiles the template, so this is only done once per template, instead
+of every time a config file is validated.
 """
 
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from jsonschema.protocols import Validator
+
 from config.validation_templates.environment_template import ENVIRONMENT_TEMPLATE
 from config.validation_templates.plane_template import PLANE_TEMPLATE
 from config.validation_templates.target_template import TARGET_TEMPLATE
+
+
+_TEMPLATES = {
+    "environment" : ENVIRONMENT_TEMPLATE,
+    "plane" : PLANE_TEMPLATE,
+    "target" : TARGET_TEMPLATE
+}
+
+# validator instances, created lazily by get_validator()
+_VALIDATORS = {}
+
+def get_validator(template_name: str)-> Validator:
+    """
+    Get the (cached) validator for one of the templates.
+
+    The validator is created (and the template itself checked) the 
+    first time it is requested, every subsequent call returns that same
+    instance.
+
+    @params:
+        - template_name (str): one of "environment", "plane" or 
+        "target".
+
+    @returns:
+        - Validator for the requested template.
+    """
+    validator = _VALIDATORS.get(template_name)
+    if validator is None:
+        template = _TEMPLATES[template_name]
+        validator_class = validator_for(template)
+        validator_class.check_schema(template)
+        validator = validator_class(template)
+        _VALIDATORS[template_name] = validator
+    return validator
+
+def validate(template_name: str, document: dict)-> None:
+    """
+    Validate a document against one of the templates.
+
+    Uses the cached validator from get_validator(). Like 
+    jsonschema.validate(), the most relevant of all errors is raised, 
+    rather than the first one that is found.
+
+    @params:
+        - template_name (str): one of "environment", "plane" or 
+        "target".
+        - document (dict): document to validate.
+
+    @raises:
+        - jsonschema.ValidationError if the document is invalid.
+    """
+    error = best_match(get_validator(template_name).iter_errors(document))
+    if error is not None:
+        raise error
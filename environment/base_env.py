@@ -1,13 +1,14 @@
 import datetime
-import json
+import math
 import numpy as np
+import orjson
 import os
 import yaml
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 import config.validation_templates as templates
 from simulation.entities import Entities
-from utils.numpy_encoder import NumpyEncoder
+from utils.observation_history import ObservationHistory
 from utils.create_path_plots import create_path_plots
 
 
@@ -49,7 +50,8 @@ class BaseEnv():
         plane_config: str="config/i-16_falangist.yaml",
         env_config: str="config/default_env.yaml",
         target_config: str="config/default_target.yaml",
-        seed: int=None
+        seed: int=None,
+        record_history: bool=False
     )-> None:
         """
         Initializer for BaseEnv class.
@@ -63,6 +65,8 @@ class BaseEnv():
             configuration. See config/default_target.yaml for more 
             info.
             - seed (int): Seed for randomizer. If None, no seed is used.
+            - record_history (bool): Record the observation history, 
+            which is needed to save it in self.close().
         """
         if seed != None:
             # global seeds is used to randomise the target spawning
@@ -70,18 +74,31 @@ class BaseEnv():
         # this seed is used to randomise the plane spawning
         self._rng = np.random.default_rng(seed)
 
-        # for saving the observation history, used in self.close()
-        self._current_iteration = 0
-        self._observation_history = {self._current_iteration : []}
-
         # delta with which to update the environment each tick
         self._dt = 1 / 60
+
+        # reusable buffer in which the state is assembled each step
+        self._state_buf = np.empty(5, dtype=np.float64)
+        # reusable [[<agent ID>, <action ID>]] buffer passed to the 
+        # entities each step
+        self._action_buf = np.zeros((1, 2), dtype=np.int64)
+
+        # for saving the observation history, used in self.close()
+        # if the history is not recorded, it can not be saved either
+        self._record_history = record_history
+        self._current_iteration = 0
+        self._observation_history = None
+        if self._record_history:
+            self._observation_history = ObservationHistory(
+                state_size=self._state_buf.shape[0]
+            )
+            self._observation_history.add_page(self._current_iteration)
         
         # validate all of the provided config files
         with open(plane_config, 'r') as stream:
             self._plane_data = yaml.safe_load(stream)
         try:
-            validate(self._plane_data, templates.PLANE_TEMPLATE)
+            templates.validate("plane", self._plane_data)
         except ValidationError as e:
             print(
                 f"A validation error occurred in the plane data: {e.message}"
@@ -90,7 +107,7 @@ class BaseEnv():
         with open(env_config, 'r') as stream:
             self._env_data = yaml.safe_load(stream)
         try:
-            validate(self._env_data, templates.ENVIRONMENT_TEMPLATE)
+            templates.validate("environment", self._env_data)
         except ValidationError as e:
             print(
                 f"A validation error occurred in the env data: {e.message}"
@@ -99,7 +116,7 @@ class BaseEnv():
         with open(target_config, 'r') as stream:
             self._target_data = yaml.safe_load(stream)
         try:
-            validate(self._target_data, templates.TARGET_TEMPLATE)
+            templates.validate("target", self._target_data)
         except ValidationError as e:
             print(
                 f"A validation error occurred in the target data: {e.message}"
@@ -107,9 +124,70 @@ class BaseEnv():
 
         # reserve memory for necessary member objects
         self._entities = None
+
+        # the spawn data only depends on the config files, so it is
+        # built once and copied whenever the entities are (re)created
+        self._create_spawn_templates()
         
         self._create_entities()
 
+    def _create_spawn_templates(self)-> None:
+        """
+        Create the read-only spawn data for the plane and target(s).
+
+        Builds the scalars and vectors of the agent and the target(s), 
+        without any spawn randomisation, and the simulation boundaries.
+        self._create_agent() and self._create_targets() copy these.
+        """
+        properties = list(self._plane_data["properties"].values())
+        # the extra data is [aoa_degree, entity_type, coll_flag, debug]
+        self._agent_scalars_template = np.concatenate(
+            (np.array(properties[:10]), np.array([0, 0, -1, 0]))
+        )
+        # the extra data is
+        # [v_uv, f_gravity, f_engine, f_drag, f_lift, pitch_uv]
+        self._agent_vectors_template = np.concatenate(
+            (np.array(properties[10:14]), np.zeros(shape=(6,2), dtype=float))
+        )
+
+        # each key in the target data is equal to a new target, 
+        # the validation template guarantees this
+        n_targets = len(self._target_data)
+        self._target_scalars_template = np.zeros(shape=(n_targets, 14))
+        self._target_vectors_template = np.zeros(shape=(n_targets, 10, 2))
+
+        for i, target_key in enumerate(list(self._target_data.keys())):
+            # set coll radius from template
+            self._target_scalars_template[i, 9] = \
+                self._target_data[target_key]["coll_radius"]
+            # set entity type flag to target
+            self._target_scalars_template[i, 11] = 1
+            # set collision flag to alive
+            self._target_scalars_template[i, 12] = -1
+
+            # set position from template
+            self._target_vectors_template[i, 3] = np.array(
+                self._target_data[target_key]["position"]
+            )
+
+        window_dimensions = self._env_data["window_dimensions"]
+        self._boundaries = np.array(
+            [
+                [0,  window_dimensions[0]],
+                [0,  window_dimensions[1]]
+            ],
+            dtype=np.float32
+        )
+
+        for template in (
+            self._agent_scalars_template,
+            self._agent_vectors_template,
+            self._target_scalars_template,
+            self._target_vectors_template,
+            self._boundaries
+        ):
+            template.flags.writeable = False
+
     def _create_entities(self)-> None:
         """
         Creates plane and target entities.
@@ -123,22 +201,21 @@ class BaseEnv():
         agent_vectors = agent_vectors.reshape((1,) + agent_vectors.shape)
         target_scalars, target_vectors = self._create_targets()
         
-        scalars = np.concatenate((agent_scalars, target_scalars))
-        vectors = np.concatenate((agent_vectors, target_vectors))
-
-        window_dimensions = self._env_data["window_dimensions"]
-        boundaries = np.array(
-            [
-                [0,  window_dimensions[0]],
-                [0,  window_dimensions[1]]
-            ]
+        # the simulation runs in single precision
+        scalars = np.concatenate(
+            (agent_scalars, target_scalars), 
+            dtype=np.float32
+        )
+        vectors = np.concatenate(
+            (agent_vectors, target_vectors), 
+            dtype=np.float32
         )
 
         self._entities = Entities(
             scalars=scalars, 
             vectors=vectors, 
             n_entities=MAX_ENTITIES, 
-            boundaries=boundaries,
+            boundaries=self._boundaries,
             plane_data=self._plane_data
         )
 
@@ -146,13 +223,13 @@ class BaseEnv():
         """
         Create agent object for self.
 
-        Use plane data to create Plane object.
+        Copies the agent spawn templates and randomises them based on
+        the plane data.
         
         @returns:
             - tuple with numpy arrays containing scalars and vectors
         """
-
-        scalars = np.array(list(self._plane_data["properties"].values())[:10])
+        scalars = self._agent_scalars_template.copy()
         # randomise spawn pitch based on config
         if self._plane_data["properties"]["max_spawn_pitch_deviation"] > 0:
             pitch_deviation = self._rng.integers(
@@ -165,12 +242,7 @@ class BaseEnv():
             )
             scalars[8] += pitch_deviation
 
-        # the extra data is [aoa_degree, entity_type, coll_flag, debug]
-        scalars = np.concatenate((scalars, np.array([0, 0, -1, 0])))
-
-        vectors = np.array(
-            list(self._plane_data["properties"].values())[10:14]
-        )
+        vectors = self._agent_vectors_template.copy()
         # randomise spawn locations based on config
         if self._plane_data["properties"]["max_spawn_position_deviation"] > 0:
             vectors[3] += self._rng.integers(
@@ -189,9 +261,6 @@ class BaseEnv():
                 np.cos(pitch_angle_rad),
                 np.sin(pitch_angle_rad)
             ])
-        # the extra data is
-        # [v_uv, f_gravity, f_engine, f_drag, f_lift, pitch_uv]
-        vectors = np.concatenate((vectors, np.zeros(shape=(6,2), dtype=float)))
 
         return scalars, vectors
 
@@ -199,28 +268,16 @@ class BaseEnv():
         """
         Create target object(s) for self.
 
-        Use target data to create Target object.
+        Copies the target spawn templates and randomises them based on
+        the target data.
 
         @returns:
             - tuple with numpy arrays containing scalars and vectors
         """
-        # each key in the target data is equal to a new target, 
-        # the validation template guarantees this
-        n_targets = len(self._target_data)
-        scalars = np.zeros(shape=(n_targets, 14))
-        vectors = np.zeros(shape=(n_targets, 10, 2))
+        scalars = self._target_scalars_template.copy()
+        vectors = self._target_vectors_template.copy()
 
         for i, target_key in enumerate(list(self._target_data.keys())):
-            # set coll radius from template
-            scalars[i, 9] = self._target_data[target_key]["coll_radius"]
-            # set entity type flag to target
-            scalars[i, 11] = 1
-            # set collision flag to alive
-            scalars[i, 12] = -1
-
-            # set position from template
-            vectors[i, 3] = np.array(self._target_data[target_key]["position"])
-            
             # randomise spawn location based on config
             if self._target_data[target_key][
                 "max_spawn_position_deviation"
@@ -262,33 +319,32 @@ class BaseEnv():
         @returns:
             - float with reward.
         """
+        px, py, vx, vy = state[0], state[1], state[2], state[3]
+
         # find closest target for reward
         closest_target_distance = float("inf")
-        i_closest_target = None
-        for i, (target_scalars, target_vectors) in enumerate(
-            zip(self._entities.targets.scalars, self._entities.targets.vectors)
+        closest_direction = None
+        for target_scalars, target_vectors in zip(
+            self._entities.targets.scalars, self._entities.targets.vectors
         ):
             if target_scalars[12] == -1:
-                distance = np.linalg.norm(target_vectors[3] - state[:2]) 
+                dx = target_vectors[3, 0] - px
+                dy = target_vectors[3, 1] - py
+                distance = math.hypot(dx, dy)
                 if distance < closest_target_distance:
                     closest_target_distance = distance
-                    i_closest_target = i
-
-        if i_closest_target != None:
-            direction_to_target = self._entities.targets.vectors[
-                i_closest_target, 
-                3
-            ] - state[:2]
-                
-            unit_vector_to_target = direction_to_target / \
-                np.linalg.norm(direction_to_target)
-
-            velocity = state[2:4]
-            unit_vector_agent = velocity / np.linalg.norm(velocity)
-
-            return -100 * np.linalg.norm(
-                unit_vector_agent - unit_vector_to_target
-            ) * state[4]
+                    closest_direction = (dx, dy)
+
+        if closest_direction != None:
+            # difference between the unit vector of the agent's velocity
+            # and the unit vector from the agent to the target
+            dx, dy = closest_direction
+            inv_distance = 1.0 / closest_target_distance
+            inv_speed = 1.0 / math.hypot(vx, vy)
+            ex = vx * inv_speed - dx * inv_distance
+            ey = vy * inv_speed - dy * inv_distance
+
+            return -100 * math.hypot(ex, ey) * state[4]
         # for the last state, if agent succeeded we dont need to 
         # calculate any distance, reward should be zero
         else:
@@ -304,7 +360,11 @@ class BaseEnv():
         @returns:
             - boolean; True if terminal, False if not
         """
-        return np.all(self._entities.targets.scalars[:, 12] != -1)
+        target_scalars = self._entities.targets.scalars
+        # there usually is only one target, which we can check directly
+        if target_scalars.shape[0] == 1:
+            return bool(target_scalars[0, 12] != -1)
+        return bool(np.all(target_scalars[:, 12] != -1))
     
     def _check_if_truncated(self)-> bool:
         """
@@ -316,7 +376,8 @@ class BaseEnv():
         @returns:
             - boolean; True if truncated, False if not
         """
-        return np.all(self._entities.airplanes.scalars[:, 12] != -1)
+        # the environment only ever contains the agent's plane
+        return bool(self._entities.airplanes.scalars[0, 12] != -1)
 
     def _calculate_observation(
             self
@@ -346,24 +407,29 @@ class BaseEnv():
             - bool with is_truncated
             - dict with info (always empty)
         """
-        pos = self._entities.airplanes.vectors[0, 3]
-        v = self._entities.airplanes.vectors[0, 2]
-        n_remaining_targets = np.count_nonzero(self._entities.targets.scalars[:, 12] == -1)
-        state = np.concatenate(
-            (pos, v, np.array(n_remaining_targets)), 
-            axis=None
+        self._state_buf[:2] = self._entities.airplanes.vectors[0, 3]
+        self._state_buf[2:4] = self._entities.airplanes.vectors[0, 2]
+        self._state_buf[4] = np.count_nonzero(
+            self._entities.targets.scalars[:, 12] == -1
         )
         
         is_terminated = self._check_if_terminated()
         is_truncated = self._check_if_truncated()
-        reward = self._calculate_reward(state)
+        reward = self._calculate_reward(self._state_buf)
         
         if is_terminated:
             reward += 200
         if is_truncated:
             reward -= 100
 
-        return(state, reward, is_terminated, is_truncated, {})
+        # the buffer is overwritten every step, so hand out a copy
+        return(
+            self._state_buf.copy(), 
+            reward, 
+            is_terminated, 
+            is_truncated, 
+            {}
+        )
 
     def _render(self)-> None:
         """
@@ -399,12 +465,13 @@ class BaseEnv():
         @returns:
             - np.ndarray with observation of resulting conditions
         """
-        actions = np.array([[0, action]])
-        self._entities.tick(self._dt, actions)
+        self._action_buf[0, 1] = action
+        self._entities.tick(self._dt, self._action_buf)
 
         # calculate, save, and return observation in current conditions
         observation = self._calculate_observation()
-        self._observation_history[self._current_iteration].append(observation)
+        if self._record_history:
+            self._observation_history.append(observation)
         
         # if the action was shoot, alter the reward accordingly
         if action == 5:
@@ -487,17 +554,16 @@ class BaseEnv():
         self._create_entities()
 
         self._current_iteration += 1
-        self._observation_history[self._current_iteration] = []
+        if self._record_history:
+            self._observation_history.add_page(self._current_iteration)
 
         # the agent's current coordinates are defined by the centre of 
         # its rect
-        pos = self._entities.airplanes.vectors[0, 3]
-        v = self._entities.airplanes.vectors[0, 2]
-        n_remaining_targets = len(self._entities.targets.scalars) - \
+        self._state_buf[:2] = self._entities.airplanes.vectors[0, 3]
+        self._state_buf[2:4] = self._entities.airplanes.vectors[0, 2]
+        self._state_buf[4] = len(self._entities.targets.scalars) - \
             np.sum(self._entities.targets.scalars[:, 12])
-        return np.concatenate(
-            (pos, v, np.array(n_remaining_targets)), axis=None
-        ), {}
+        return self._state_buf.copy(), {}
 
     def close(
         self, 
@@ -509,7 +575,8 @@ class BaseEnv():
         Close environment and output history.
 
         Will create a folder indicated by the current date and time, 
-        provided save == True in which resides:
+        provided save == True and the environment was created with
+        record_history == True, in which resides:
             - a json file with the entire observation history.
             - an image per iteration, which displays the flown path of 
             the agent, along with the reward (indicated by the colour).
@@ -519,6 +586,15 @@ class BaseEnv():
             - save_figs (bool): Save the plots or not.
             - figs_stride (int): Stride for saving the figures.
         """
+        # without a recorded history, there is nothing to save
+        if (save_json or save_figs) and not self._record_history:
+            print(
+                "\033[31mUnable to save the observation history, as it "
+                "was not recorded. Create the environment with "
+                "`record_history=True` to save it.\033[37m"
+            )
+            return
+
         # prepare the output folder
         if save_json or save_figs:
             folder_path = "output/" \
@@ -527,16 +603,22 @@ class BaseEnv():
 
         # write all the observations to a json file
         if save_json:
+            # the iteration numbers are integer keys, hence 
+            # OPT_NON_STR_KEYS
             with open(
-                f"{folder_path}/_observation_history.json", "w"
+                f"{folder_path}/_observation_history.json", "wb"
             ) as outfile: 
-                json.dump(self._observation_history, outfile, cls=NumpyEncoder)
+                outfile.write(orjson.dumps(
+                    self._observation_history.as_dict(), 
+                    option=orjson.OPT_SERIALIZE_NUMPY | 
+                        orjson.OPT_NON_STR_KEYS
+                ))
 
         # create all the graphs and save them to the `folder_path`
         if save_figs:
             create_path_plots(
                 folder_path, 
-                self._observation_history, 
+                self._observation_history.as_dict(), 
                 self._env_data,
                 figs_stride
             )
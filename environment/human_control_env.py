@@ -4,6 +4,16 @@ import pygame
 from environment.human_rendering_env import HumanRenderingEnv
 
 
+# keys that control the plane and their corresponding actions, 
+# in order of priority
+ACTION_KEYS = (
+    (pygame.K_UP, 1),       # up = pitch up
+    (pygame.K_DOWN, 2),     # down = pitch down
+    (pygame.K_RIGHT, 3),    # right = increase throttle
+    (pygame.K_LEFT, 4),     # left = decrease throttle
+    (pygame.K_SPACE, 5)     # space = shoot a bullet
+)
+
 class HumanControlEnv(HumanRenderingEnv):
     """
     Human control environment class.
@@ -31,6 +41,59 @@ class HumanControlEnv(HumanRenderingEnv):
         Closes the environment and thereby outputs its entire history.
     """
 
+    def __init__(
+        self,
+        plane_config: str="config/i-16_falangist.yaml",
+        env_config: str="config/default_env.yaml",
+        target_config: str="config/default_target.yaml",
+        seed: int=None,
+        record_history: bool=False
+    )-> None:
+        """
+        Initializer for HumanControlEnv class.
+
+        @params:
+            - plane_config (str): Path to yaml file with plane 
+            configuration. See config/i-16_falangist.yaml for more info.
+            - env_config (str): Path to yaml file with environment 
+            configuration. See config/default_env.yaml for more info.
+            - target_config (str): Path to yaml file with target 
+            configuration. See config/default_target.yaml for more 
+            info.
+            - seed (int): seed for randomizer. If None, no seed is used.
+            - record_history (bool): Record the observation history, 
+            which is needed to save it in self.close().
+        """
+        super().__init__(
+            plane_config=plane_config,
+            env_config=env_config,
+            target_config=target_config,
+            seed=seed,
+            record_history=record_history
+        )
+
+        # action belonging to the keys that are currently pressed
+        self._current_action = 0
+
+    def _update_action(self)-> None:
+        """
+        Update the current action based on the keyboard.
+
+        The key states only change through key events, so the keyboard
+        is only read again if any of these arrived since the last step.
+        The event queue still holds the events that were pumped in the 
+        previous HumanRenderingEnv.step(), so it is not pumped here.
+        """
+        if not pygame.event.peek((pygame.KEYDOWN, pygame.KEYUP), pump=False):
+            return
+
+        self._current_action = 0
+        keys = pygame.key.get_pressed()
+        for key, key_action in ACTION_KEYS:
+            if keys[key]:
+                self._current_action = key_action
+                break
+
     def step(self, action: int=0)-> np.ndarray:
         """
         Step function for human control environment.
@@ -46,23 +109,6 @@ class HumanControlEnv(HumanRenderingEnv):
         """
         # provided action argument is ignored as this instance should
         # be controlled manually
-        action = 0 
+        self._update_action()
 
-        keys = pygame.key.get_pressed()
-        # up = pitch up
-        if keys[pygame.K_UP]:
-            action = 1
-        # down = pitch down
-        elif keys[pygame.K_DOWN]:
-            action = 2
-        # right = increase throttle
-        elif keys[pygame.K_RIGHT]:
-            action = 3
-        # left = decrease throttle
-        elif keys[pygame.K_LEFT]:
-            action = 4
-        # space = shoot a bullet
-        elif keys[pygame.K_SPACE]:
-            action = 5
-
-        return super().step(action=action)
+        return super().step(action=self._current_action)
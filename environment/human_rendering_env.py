@@ -36,7 +36,8 @@ class HumanRenderingEnv(BaseEnv):
         plane_config: str="config/i-16_falangist.yaml",
         env_config: str="config/default_env.yaml",
         target_config: str="config/default_target.yaml",
-        seed: int=None
+        seed: int=None,
+        record_history: bool=False
     )-> None:
         """
         Initializer for HumanRenderingEnv class.
@@ -50,6 +51,8 @@ class HumanRenderingEnv(BaseEnv):
             configuration. See config/default_target.yaml for more 
             info.
             - seed (int): seed for randomizer. If None, no seed is used.
+            - record_history (bool): Record the observation history, 
+            which is needed to save it in self.close().
         """
         # place pygame window in top left of monitor(s)
         os.environ['SDL_VIDEO_WINDOW_POS'] = f"{0},{0}"
@@ -59,7 +62,8 @@ class HumanRenderingEnv(BaseEnv):
             plane_config=plane_config,
             env_config=env_config,
             target_config=target_config,
-            seed=seed
+            seed=seed,
+            record_history=record_history
         )
 
         # sprite data is not mandatory in config, 
@@ -81,11 +85,22 @@ class HumanRenderingEnv(BaseEnv):
 
         self._create_sprites()
 
+        # lookup table with the bullet sprite rotation in whole degrees,
+        # indexed by the velocity vector scaled to [-127, 127] + 128
+        lut_range = np.arange(-128, 128)
+        self._bullet_angle_lut = ((
+            np.degrees(np.arctan2(lut_range[:, None], lut_range[None, :]))
+            + 270
+        ) % 360).astype(np.int16)
+
     def _create_sprites(self)-> None:
         """
         Create background object for self.
 
         Use environment data to create background object.
+
+        All sprites are converted to the pixel format of the screen
+        once, so blitting them does not require any conversion.
         """
         self._background_sprite = pygame.image.load(
             self._env_data["background"]["sprite"]
@@ -93,22 +108,86 @@ class HumanRenderingEnv(BaseEnv):
         self._background_sprite = pygame.transform.scale(
             self._background_sprite,
             pygame.display.get_surface().get_size()
-        )
+        ).convert()
 
         self._target_sprites = [pygame.transform.scale(
             pygame.image.load(self._target_data[target_key]["sprite"]), 
             self._target_data[target_key]["size"]
-        ) for target_key in self._target_data.keys()]
+        ).convert_alpha() for target_key in self._target_data.keys()]
+        # offsets from the center of the target sprites to their top left
+        self._target_offsets = [
+            (-(sprite.get_width() // 2), -(sprite.get_height() // 2))
+            for sprite in self._target_sprites
+        ]
 
         self._bullet_sprite = pygame.transform.scale(
             pygame.image.load(self._plane_data["bullet_config"]["sprite"]),
             self._plane_data["bullet_config"]["size"]
-        )
+        ).convert_alpha()
 
         self._plane_sprite = pygame.transform.scale(
             pygame.image.load(self._plane_data["sprite"]["side_view_dir"]),
             self._plane_data["sprite"]["size"]
-        )
+        ).convert_alpha()
+
+        # rotated sprites, keyed by their angle in whole degrees
+        self._bullet_rot_cache = {}
+        self._plane_rot_cache = {}
+
+        # screen areas covered by sprites in the previous frame, None 
+        # if the entire background still has to be drawn
+        self._dirty_rects = None
+
+    def _create_entities(self)-> None:
+        """
+        Creates plane and target entities.
+
+        See BaseEnv._create_entities(). Also stores views of the target
+        positions and collision flags, which are used for rendering.
+        """
+        super()._create_entities()
+
+        # these views stay valid until the entities are recreated
+        self._target_positions = self._entities.targets.vectors[:, 3]
+        self._target_flags = self._entities.targets.scalars[:, 12]
+
+    def _rotate_sprite(
+        self, 
+        cache: dict, 
+        sprite: pygame.Surface, 
+        angle: float
+    )-> tuple[pygame.Surface, tuple[int, int]]:
+        """
+        Rotate sprite, using a cache of previously rotated sprites.
+
+        The angle is truncated to whole degrees, so at most 360 rotated 
+        versions of the sprite are ever created. Along with the rotated
+        sprite, the offset from its center to its top left corner is 
+        cached, so it can be blitted centered on a position directly.
+
+        @params:
+            - cache (dict): cache belonging to `sprite`.
+            - sprite (pygame.Surface): unrotated sprite.
+            - angle (float): rotation in degrees.
+
+        @returns:
+            - tuple with the rotated sprite (pygame.Surface) and the 
+            offset (tuple[int, int]) to add to its center position.
+        """
+        key = int(angle) % 360
+        cached = cache.get(key)
+        if cached is None:
+            rotated_sprite = pygame.transform.rotate(
+                sprite, 
+                key
+            ).convert_alpha()
+            offset = (
+                -(rotated_sprite.get_width() // 2), 
+                -(rotated_sprite.get_height() // 2)
+            )
+            cached = (rotated_sprite, offset)
+            cache[key] = cached
+        return cached
 
     def _render(self) -> None:
         """
@@ -116,30 +195,42 @@ class HumanRenderingEnv(BaseEnv):
         environment.
         """
         # gather all rotation instructions for bullets and save to tuple
-        alive_bullets = self._entities.bullets.vectors[(
-            (self._entities.bullets.scalars[:, 12] == -1) &
-            (self._entities.bullets.scalars[:, 11] != -1)
+        # living bullets are always stored at the front of the matrices
+        n_bullets = self._entities.bullets.n_bullets
+        bullet_scalars = self._entities.bullets.scalars[:n_bullets]
+        alive_bullets = self._entities.bullets.vectors[:n_bullets][(
+            (bullet_scalars[:, 12] == -1) &
+            (bullet_scalars[:, 11] != -1)
         )]
 
-        rotate_instructions = (
-            np.degrees(
-                np.arctan2(alive_bullets[:, 2, 0], alive_bullets[:, 2, 1])
-            ) + 270
-        ) % 360
+        # look up the whole degree angles in one go, so the loop below 
+        # only handles plain python ints. Scaling the velocity by its 
+        # largest component keeps the direction and fits the table.
+        velocities = alive_bullets[:, 2]
+        scale = 127 / np.maximum(np.abs(velocities).max(axis=1), 1e-9)
+        lut_indices = np.rint(velocities * scale[:, None]).astype(np.int64) \
+            + 128
+        rotate_instructions = self._bullet_angle_lut[
+            lut_indices[:, 0], 
+            lut_indices[:, 1]
+        ]
+
+        # use coordinates as center for sprite, rounded to whole pixels
+        bullet_positions = np.floor(alive_bullets[:, 3] + 0.5).astype(np.int64)
 
         blit_data_bullets = []
-        for bullet_vectors, rotate_instruction in zip(
-            alive_bullets, 
-            rotate_instructions
+        for (x, y), rotate_instruction in zip(
+            bullet_positions.tolist(), 
+            rotate_instructions.tolist()
         ):
-            rotated_sprite = pygame.transform.rotate(
+            rotated_sprite, (offset_x, offset_y) = self._rotate_sprite(
+                self._bullet_rot_cache,
                 self._bullet_sprite,
                 rotate_instruction
             )
-            # use coordinates as center for sprite
-            bullet_rect = rotated_sprite.get_rect()
-            bullet_rect.center = bullet_vectors[3]
-            blit_data_bullets.append((rotated_sprite, bullet_rect.topleft))
+            blit_data_bullets.append(
+                (rotated_sprite, (x + offset_x, y + offset_y))
+            )
 
         # gather all rotation instructions for planes and save to tuple
         alive_airplanes = self._entities.airplanes.vectors[
@@ -150,37 +241,62 @@ class HumanRenderingEnv(BaseEnv):
             (self._entities.airplanes.scalars[:, 12] == -1)
         ][:, 8]
 
+        # use coordinates as center for sprite, rounded to whole pixels
+        airplane_positions = np.floor(alive_airplanes[:, 3] + 0.5).astype(
+            np.int64
+        )
+
         blit_data_planes = []
-        for airplane_vectors, rotate_instruction in zip(
-            alive_airplanes, 
-            rotate_instructions
+        for (x, y), rotate_instruction in zip(
+            airplane_positions.tolist(), 
+            rotate_instructions.tolist()
         ):
-            rotated_sprite = pygame.transform.rotate(
+            rotated_sprite, (offset_x, offset_y) = self._rotate_sprite(
+                self._plane_rot_cache,
                 self._plane_sprite,
                 rotate_instruction
             )
-            # use coordinates as center for sprite
-            plane_rect = rotated_sprite.get_rect()
-            plane_rect.center = airplane_vectors[3]
-            blit_data_planes.append((rotated_sprite, plane_rect.topleft))
+            blit_data_planes.append(
+                (rotated_sprite, (x + offset_x, y + offset_y))
+            )
 
         # put target sprite(s) position in center
+        target_positions = np.floor(self._target_positions + 0.5).astype(
+            np.int64
+        )
         blit_data_targets = []
-        for i, target_sprite in enumerate(self._target_sprites):
-            if self._entities.targets.scalars[i, 12] == -1:
-                target_rect = target_sprite.get_rect()
-                target_rect.center = self._entities.targets.vectors[i, 3]
-                blit_data_targets.append((target_sprite, target_rect.topleft))
-
-        # blit all objects in order of background, target, bullet, plane
-        self.screen.blits(
-            blit_sequence=[
-                # Background
-                (self._background_sprite, (0, 0)),
-            ] + blit_data_targets + blit_data_bullets + blit_data_planes
+        for target_sprite, (offset_x, offset_y), (x, y), flag in zip(
+            self._target_sprites, 
+            self._target_offsets,
+            target_positions.tolist(),
+            self._target_flags.tolist()
+        ):
+            if flag == -1:
+                blit_data_targets.append(
+                    (target_sprite, (x + offset_x, y + offset_y))
+                )
+
+        if self._dirty_rects is None:
+            # nothing has been drawn yet, so draw the entire background
+            self.screen.blit(self._background_sprite, (0, 0))
+            restored_rects = [self.screen.get_rect()]
+        else:
+            # only restore the background where sprites were drawn in 
+            # the previous frame
+            restored_rects = self.screen.blits(
+                blit_sequence=[
+                    (self._background_sprite, rect, rect) 
+                    for rect in self._dirty_rects
+                ]
+            )
+
+        # blit all objects in order of target, bullet, plane
+        self._dirty_rects = self.screen.blits(
+            blit_sequence=blit_data_targets + blit_data_bullets + \
+                blit_data_planes
         )
         
-        pygame.display.flip()
+        pygame.display.update(restored_rects + self._dirty_rects)
 
         
     def step(self, action: int)-> np.ndarray:
@@ -199,15 +315,30 @@ class HumanRenderingEnv(BaseEnv):
                 * 5: shoot a bullet
         
         @returns:
-            - np.ndarray with observation of resulting conditions
+            - np.ndarray with observation of resulting conditions, or
+            None if the game has been quit.
         """
-
-        # check if the game has bene quit, which case the game is closed
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                # if you close the environment mid run, we assume you
-                # do not want to save the run information
-                self.close()
+        # the queue still holds the events that were pumped in the 
+        # previous step, check and drop those before pumping new ones.
+        # Events are only peeked at, so no python event objects have to
+        # be created for them.
+        expose_events = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE)
+        has_quit = pygame.event.peek(pygame.QUIT, pump=False)
+        is_exposed = pygame.event.peek(expose_events, pump=False)
+        pygame.event.clear(pump=False)
+        pygame.event.pump()
+
+        # check if the game has been quit, which case the game is closed
+        if has_quit or pygame.event.peek(pygame.QUIT, pump=False):
+            # if you close the environment mid run, we assume you
+            # do not want to save the run information
+            self.close()
+            return None
+
+        # if (part of) the window has been invalidated by the os, e.g. 
+        # after being minimised, the entire screen has to be redrawn
+        if is_exposed or pygame.event.peek(expose_events, pump=False):
+            self._dirty_rects = None
 
         step_info = super().step(action=action)
 
@@ -134,7 +134,8 @@ class Airplanes:
         self.vectors[:, 8, 1] = norm_lift * -self.vectors[:, 4, 0]
 
         # drag force vector
-        coef_drag = (self.scalars[:, 10] / np.sqrt(40))**2 + self.scalars[:, 4]
+        coef_drag = (self.scalars[:, 10] / math.sqrt(40))**2 + \
+            self.scalars[:, 4]
         norm_drag = self.scalars[:, 1] * coef_drag * np.linalg.norm(
             self.vectors[:, 2], 
             axis=1
@@ -148,7 +149,7 @@ class Airplanes:
         self.vectors[:, 3] += dt * self.vectors[:, 2]
 
         # induced torque
-        filter = np.zeros(self.scalars.shape[0])
+        filter = np.zeros(self.scalars.shape[0], dtype=self.scalars.dtype)
         filter[self.scalars[:, 10] < self.vectors[:, 0, 0]] = 1
         filter[self.scalars[:, 10] > self.vectors[:, 1, 0]] = -1
         self.scalars[:, 8] = (
@@ -178,7 +179,7 @@ class Airplanes:
         l = self.scalars.shape[0]
 
         # action 1 pitch up
-        filter = np.zeros(l)
+        filter = np.zeros(l, dtype=self.scalars.dtype)
         filter[actions[actions[:, 1] == 1][:, 0]] = 1
         self.scalars[:, 8] = (
             self.scalars[:, 8] + 
@@ -188,7 +189,7 @@ class Airplanes:
         ) % 360
 
         # action 2 pitch down
-        filter = np.zeros(l)
+        filter = np.zeros(l, dtype=self.scalars.dtype)
         filter[actions[actions[:, 1] == 2][:, 0]] = 1
         self.scalars[:, 8] = (
             self.scalars[:, 8] - 
@@ -198,13 +199,13 @@ class Airplanes:
         ) % 360
 
         # action 3 throttle up
-        filter = np.zeros(l)
+        filter = np.zeros(l, dtype=self.scalars.dtype)
         filter[actions[actions[:, 1] == 3][:, 0]] = 1
         self.scalars[:, 7] += dt * 100 * filter
         self.scalars[self.scalars[:, 7] > 100, 7] = 100
 
         # action 4 throttle down
-        filter = np.zeros(l)
+        filter = np.zeros(l, dtype=self.scalars.dtype)
         filter[actions[actions[:, 1] == 4][:, 0]] = 1
         self.scalars[:, 7] -= dt * 100 * filter
         self.scalars[self.scalars[:, 7] < 0, 7] = 0
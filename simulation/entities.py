@@ -1,10 +1,58 @@
 import numpy as np
+from numba import njit
 
 from simulation.airplanes import Airplanes
 from simulation.targets import Targets
 from simulation.bullets import Bullets
 
 
+@njit(cache=True, fastmath=True)
+def _entity_collision(
+    scalars: np.ndarray, 
+    vectors: np.ndarray, 
+    boundaries: np.ndarray
+)-> None:
+    """
+    Compiled kernel for Entities.entity_collision().
+
+    Loops over all pairs of alive entities, instead of building the 
+    full distance and radius matrices. All collisions are determined
+    before any collision flag is written, so the outcome does not 
+    depend on the order of the entities.
+
+    @params:
+        - scalars (np.ndarray): Scalars of all entities.
+        - vectors (np.ndarray): Vectors of all entities.
+        - boundaries (np.ndarray): Simulation boundaries with 
+        shape[[domain_x],[domain_y]], e.g. [[0,1280],[0,720]].
+    """
+    alive = np.nonzero((scalars[:, 11] != -1) & (scalars[:, 12] == -1))[0]
+    n = alive.shape[0]
+    collision = np.zeros(n, dtype=np.bool_)
+
+    for a in range(n):
+        i = alive[a]
+        x = vectors[i, 3, 0]
+        y = vectors[i, 3, 1]
+        if (
+            x <= boundaries[0, 0] or x >= boundaries[0, 1] or
+            y <= boundaries[1, 0] or y >= boundaries[1, 1]
+        ):
+            collision[a] = True
+        for b in range(a + 1, n):
+            j = alive[b]
+            dx = x - vectors[j, 3, 0]
+            dy = y - vectors[j, 3, 1]
+            r = scalars[i, 9] + scalars[j, 9]
+            if dx * dx + dy * dy < r * r:
+                collision[a] = True
+                collision[b] = True
+
+    # -1 when no collision, 1 when collision
+    for a in range(n):
+        scalars[alive[a], 12] = 1 if collision[a] else -1
+
+
 class Entities:
     """
     Entities container class.
@@ -116,8 +164,14 @@ class Entities:
             - plane_data (dict): See plane yamls in config/ for more 
             information.
         """
-        self.scalars = np.zeros((n_entities, scalars.shape[1]))
-        self.vectors = np.zeros((n_entities, vectors.shape[1], 2))
+        self.scalars = np.zeros(
+            (n_entities, scalars.shape[1]), 
+            dtype=np.float32
+        )
+        self.vectors = np.zeros(
+            (n_entities, vectors.shape[1], 2), 
+            dtype=np.float32
+        )
         self.scalars[:,11] = -1
         self.scalars[:,12] = -1
 
@@ -188,7 +242,10 @@ class Entities:
             (self.scalars[id, 9][:, None] + self._BULLET_COLL_RADIUS + 2)  
         v = self.vectors[id, 2] + \
             (self._BULLET_SPEED_SCALER * self.vectors[id, 4]) 
-        vectors = np.zeros((id.shape[0], self.vectors.shape[1], 2))
+        vectors = np.zeros(
+            (id.shape[0], self.vectors.shape[1], 2), 
+            dtype=np.float32
+        )
         vectors[:, 3] = pos
         vectors[:, 2] = v
         self.n_bullets += id.shape[0]
@@ -204,24 +261,4 @@ class Entities:
         the map boundaries are not objects, they will not be killed.
         Instead the source object gets killed.
         """
-        mask = (self.scalars[:, 11] != -1) & (self.scalars[:, 12] == -1)
-        vectors = self.vectors[mask]
-        scalars = self.scalars[mask]
-
-        pos = vectors[:, 3]
-        radii = scalars[:, 9]
-
-        d = np.sum((pos[:, np.newaxis] - pos) ** 2, axis=2)
-        r = (radii[:, np.newaxis] + radii) ** 2
-        np.fill_diagonal(r, -1)
-        collision = np.any(d < r, axis=1)
-
-        bounds = (
-            pos[:, 0] <= self._boundaries[0, 0]) | (
-            pos[:, 0] >= self._boundaries[0, 1]) | (
-            pos[:, 1] <= self._boundaries[1, 0]) | (
-            pos[:, 1] >= self._boundaries[1, 1]
-        )
-
-        # -1 when no collision, 1 when collision
-        self.scalars[mask, 12] = np.where(collision | bounds, 1, -1)
+        _entity_collision(self.scalars, self.vectors, self._boundaries)
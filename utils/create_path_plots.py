@@ -1,9 +1,91 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 import itertools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.image import imread
 
 
+# background image of the environment, decoded once per worker process
+# by _init_worker()
+_background_image = None
+
+def _init_worker(background_path: str)-> None:
+    """
+    Initializer for the plotting worker processes.
+
+    Decodes the background image once, so it does not have to be read
+    again for every figure.
+
+    @params:
+        - background_path (str): Path to background image. If None, the
+        figures are made without background.
+    """
+    global _background_image
+    _background_image = None
+    if background_path != None:
+        _background_image = imread(background_path)
+
+def _plot_path(
+    iteration_observations: tuple[int, dict],
+    folder_path: str,
+    env_data: dict
+)-> None:
+    """
+    Create and save the path plot of a single iteration.
+
+    @params:
+        - iteration_observations (tuple[int, dict]): Iteration and its
+        observation columns, as returned by ObservationHistory.as_dict().
+        - folder_path (str): Path to output folder.
+        - env_data (dict): Environment configuration.
+    """
+    iteration, observations = iteration_observations
+    rewards = observations["rewards"]
+    # if any of the runs are empty, dont plot them
+    if rewards.shape[0] == 0:
+        return
+
+    normalize_rewards = matplotlib.colors.Normalize(
+        rewards.min(), 
+        rewards.max()
+    )
+
+    colour_map = matplotlib.colormaps['RdYlGn']
+
+    points = observations["states"][:, :2].reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+
+    # Create a LineCollection from the segments
+    lc = LineCollection(
+        segments, 
+        cmap=colour_map, 
+        norm=normalize_rewards
+    )
+    lc.set_array(rewards)
+
+    # the figure is not managed by pyplot, so it is saved through the
+    # Agg canvas, independent of the (interactive) pyplot backend
+    fig = Figure()
+    ax = fig.subplots()
+    ax.add_collection(lc)
+    ax.set_xlim(0, env_data["window_dimensions"][0])
+    ax.set_ylim(0, env_data["window_dimensions"][1])
+    ax.invert_yaxis()
+    cbar = fig.colorbar(lc, ax=ax)
+    cbar.set_label('Reward')
+    ax.set_title(f"Flight path for iteration {iteration}.")
+
+    if _background_image is not None:
+        ax.imshow(_background_image)
+
+    fig.savefig(f"{folder_path}/flight_path_it-{iteration}")
+
 def create_path_plots(
     folder_path: str, 
     observation_history: dict,
@@ -17,72 +99,59 @@ def create_path_plots(
     figure. Above which it plots the x,y flight history of the agent.
     It colours this graph in accordance with the normalized reward 
     provided. It saves the figure in the provided folder. It does this
-    for each of the runs in the observation history.
+    for each of the runs in the observation history. On linux, the 
+    figures are spread out over multiple forked processes, on other 
+    platforms they are made one after another.
 
     @params:
         - folder_path (str): Path to output folder.
         If this folder does not exist, no new one will be made.
-        - observation_history (dict): Dictionary containing list of 
-        observations per iteration/run.
+        - observation_history (dict): Dictionary containing the 
+        observation columns per iteration/run, as returned by 
+        ObservationHistory.as_dict().
         - env_data (dict): Environment configuration.
             See config/default_env.yaml for more info.
             In theory, it only needs to contain the window dimensions
             and preferably the background data.
         - figs_stride (int): Stride for saving the figures.
     """
+    # try to find the background, if available
+    # if any of these settings are missing, 
+    # no background will be plotted
+    try:
+        background_path = env_data["background"]["sprite"]
+    except KeyError:
+        print(
+            "\033[31mERROR OCCURRED DURING PLOTTING FIGURES: Unable to"
+            " locate background image from environment data. Ignoring "
+            "issue and attempting to make plots without background ima"
+            "ge.\033[37m"
+        )
+        background_path = None
+
     obs_hist_iter = iter(observation_history.items())
-    for iteration, observations in itertools.islice(
-        obs_hist_iter, 0, None, figs_stride
-    ):
-        try:
-            vertices = [
-                (x, y, r) for (x, y, _, _, _), r, _, _, _ in observations
-            ]
-            
-            xs, ys, rewards = zip(*vertices)
-            normalize_rewards = plt.Normalize(min(rewards), max(rewards))
-
-            colour_map = plt.get_cmap('RdYlGn')
-
-            points = np.array([xs, ys]).T.reshape(-1, 1, 2)
-            segments = np.concatenate([points[:-1], points[1:]], axis=1)
-            
-            # Create a LineCollection from the segments
-            lc = LineCollection(
-                segments, 
-                cmap=colour_map, 
-                norm=normalize_rewards
-            )
-            lc.set_array(np.array(rewards))
-            
-            fig, ax = plt.subplots()
-            ax.add_collection(lc)
-            ax.set_xlim(0, env_data["window_dimensions"][0])
-            ax.set_ylim(0, env_data["window_dimensions"][1])
-            ax.invert_yaxis()
-            cbar = plt.colorbar(lc, ax=ax)
-            cbar.set_label('Reward')
-            ax.set_title(f"Flight path for iteration {iteration}.")
-
-            # try to plot the backgrounds, if available
-            # if any of these settings are missing, 
-            # nothing will be plotted
-            try:
-                background_image = plt.imread(env_data["background"]["sprite"])
-                ax.imshow(background_image)
-
-            except KeyError:
-                print(
-                    "\033[31mERROR OCCURRED DURING PLOTTING FIGURES: Unable to"
-                    " locate background image from environment data. Ignoring "
-                    "issue and attempting to make plots without background ima"
-                    "ge.\033[37m"
-                )
-                pass
-
-            plt.savefig(f"{folder_path}/flight_path_it-{iteration}")
-            plt.close(fig)
-        
-        # if any of the runs are empty, dont plot them
-        except ValueError:
-            continue
\ No newline at end of file
+    selected_observations = list(
+        itertools.islice(obs_hist_iter, 0, None, figs_stride)
+    )
+    if len(selected_observations) == 0:
+        return
+    plot_path = partial(_plot_path, folder_path=folder_path, env_data=env_data)
+
+    # only linux can safely fork the workers. Elsewhere they would be 
+    # spawned, which re-imports the user's main script and reruns the
+    # entire training loop, or forked unsafely (macOS frameworks can 
+    # crash forked children), so there the figures are made serially
+    if not sys.platform.startswith("linux"):
+        _init_worker(background_path)
+        for iteration_observations in selected_observations:
+            plot_path(iteration_observations)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, len(selected_observations)),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(background_path,)
+    ) as executor:
+        # consume the results, so exceptions in the workers are raised
+        list(executor.map(plot_path, selected_observations))
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class ObservationHistory:
+    """
+    ObservationHistory class.
+
+    This class stores the observations of every iteration/run of an
+    environment. Instead of keeping a list of observation tuples, every
+    field of the observation is written into its own preallocated numpy
+    array, which is doubled in size whenever it runs full.
+
+    This class has no public member variables.
+
+    @public methods:
+    + add_page(iteration: int)-> None
+        Adds a new, empty, page for an iteration. All subsequent
+        observations are written to this page.
+    + append(observation: tuple)-> None
+        Writes an observation to the current page.
+    + as_dict()-> dict
+        Returns all of the recorded observations per iteration.
+    """
+
+    def __init__(self, state_size: int, initial_capacity: int=1024)-> None:
+        """
+        Initializer for ObservationHistory class.
+
+        @params:
+            - state_size (int): Number of values in a state.
+            - initial_capacity (int): Number of observations a new page
+            can hold before it has to grow.
+        """
+        self._state_size = state_size
+        self._initial_capacity = initial_capacity
+        self._pages = {}
+        self._lengths = {}
+        self._current_page = None
+        self._current_iteration = None
+
+    def add_page(self, iteration: int)-> None:
+        """
+        Add a new, empty, page for an iteration.
+
+        @params:
+            - iteration (int): Iteration the page belongs to.
+        """
+        self._current_page = {
+            "states" : np.empty(
+                (self._initial_capacity, self._state_size),
+                dtype=np.float64
+            ),
+            "rewards" : np.empty(self._initial_capacity, dtype=np.float64),
+            "is_terminated" : np.empty(self._initial_capacity, dtype=bool),
+            "is_truncated" : np.empty(self._initial_capacity, dtype=bool)
+        }
+        self._current_iteration = iteration
+        self._pages[iteration] = self._current_page
+        self._lengths[iteration] = 0
+
+    def append(self, observation: tuple)-> None:
+        """
+        Write an observation to the current page.
+
+        @params:
+            - observation (tuple): Observation as returned by
+            BaseEnv._calculate_observation(). The info dictionary is
+            not stored, as it is always empty.
+        """
+        page = self._current_page
+        i = self._lengths[self._current_iteration]
+        if i == page["rewards"].shape[0]:
+            # double the capacity of every column
+            for key, column in page.items():
+                page[key] = np.concatenate((column, np.empty_like(column)))
+
+        state, reward, is_terminated, is_truncated, _ = observation
+        page["states"][i] = state
+        page["rewards"][i] = reward
+        page["is_terminated"][i] = is_terminated
+        page["is_truncated"][i] = is_truncated
+        self._lengths[self._current_iteration] = i + 1
+
+    def as_dict(self)-> dict:
+        """
+        Get all of the recorded observations per iteration.
+
+        @returns:
+            - dict with per iteration a dict with the columns "states",
+            "rewards", "is_terminated" and "is_truncated". Every column
+            is a numpy array (view) containing only the recorded
+            observations.
+        """
+        return {
+            iteration : {
+                key : column[:self._lengths[iteration]]
+                for key, column in page.items()
+            } for iteration, page in self._pages.items()
+        }